@@ -1,8 +1,22 @@
+import io
 import os
+import json
 import base64
+import asyncio
+import hashlib
+import sqlite3
+import time
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+import matplotlib
+import openpyxl
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 import streamlit as st
+from streamlit.runtime.uploaded_file_manager import UploadedFile
 
 # =========================
 # Page Config
@@ -16,86 +30,13 @@ st.set_page_config(
 # =========================
 # Custom Styles (mobile friendly, light UI)
 # =========================
-st.markdown("""
-<style>
-/* Global */
-html, body, .main {
-    background: linear-gradient(180deg, #f7faff 0%, #ffffff 100%) !important;
-}
-.block-container {
-    padding-top: 1rem;
-    padding-bottom: 2rem;
-    max-width: 1000px;
-}
-
-/* Hero Section */
-.hero {
-    background: linear-gradient(135deg, #e0f2fe, #f0f9ff);
-    padding: 1.5rem;
-    border-radius: 20px;
-    box-shadow: 0 4px 20px rgba(0,0,0,0.06);
-    text-align: center;
-}
-.hero h1 {
-    font-size: clamp(24px, 4.2vw, 38px);
-    margin-bottom: .3rem;
-    color: #0f172a;
-    font-weight: 700;
-}
-.hero p {
-    font-size: clamp(14px, 2.8vw, 17px);
-    color: #334155;
-    margin-top: 0;
-}
-
-/* Cards */
-.card {
-    background: #ffffff;
-    border-radius: 16px;
-    padding: 1rem 1.25rem;
-    box-shadow: 0 4px 18px rgba(0,0,0,0.05);
-    margin-top: 1rem;
-}
-
-/* Buttons */
-.stButton>button {
-    width: 100%;
-    border-radius: 10px;
-    padding: .8rem 1rem;
-    font-size: 1rem;
-    font-weight: 600;
-    color: #ffffff;
-    background: linear-gradient(90deg, #2563eb, #1e40af);
-    border: none;
-    box-shadow: 0 4px 10px rgba(37,99,235,0.4);
-    transition: transform .1s ease-in-out;
-}
-.stButton>button:hover {
-    transform: translateY(-2px);
-}
-
-/* Dataframe */
-[data-testid="stDataFrame"] {
-    border: 1px solid #e2e8f0;
-    border-radius: 12px;
-}
-
-/* Expander */
-.streamlit-expanderHeader {
-    font-size: 1rem;
-    font-weight: 600;
-    color: #1e293b;
-}
-
-/* Footer */
-.footer {
-    text-align: center;
-    margin-top: 2rem;
-    color: #64748b;
-    font-size: .9rem;
-}
-</style>
-""", unsafe_allow_html=True)
+@st.cache_resource
+def load_css():
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "style.css"), encoding="utf-8") as f:
+        return f"<style>{f.read()}</style>"
+
+# Streamlit drops elements not re-emitted on a rerun, so only the file read is cached
+st.markdown(load_css(), unsafe_allow_html=True)
 
 # =========================
 # Set API key from secrets
@@ -103,13 +44,26 @@ html, body, .main {
 if "OPENAI_API_KEY" in st.secrets:
     os.environ["OPENAI_API_KEY"] = st.secrets["OPENAI_API_KEY"]
 
+# Client-side rate limits, sized to the account's OpenAI tier
+OPENAI_RPM = int(st.secrets.get("OPENAI_RPM", 500))
+OPENAI_TPM = int(st.secrets.get("OPENAI_TPM", 200_000))
+
 # =========================
 # Imports for LIDA
 # =========================
+# Headless backend, selected before LIDA imports pyplot
+matplotlib.use("Agg")
+matplotlib.rcParams["figure.max_open_warning"] = 0
+import matplotlib.pyplot as plt
+
 LIDA_READY = True
 try:
     from lida import Manager
-    from llmx import llm
+    from lida.datamodel import Goal
+    from lida.utils import clean_column_names
+    from llmx import llm, TextGenerationConfig
+    from openai import RateLimitError
+    from tenacity import Retrying, retry_if_exception_type, stop_after_attempt, wait_random_exponential
 except Exception as e:
     LIDA_READY = False
     INIT_ERROR = e
@@ -118,29 +72,226 @@ except Exception as e:
 # =========================
 # LIDA Helpers
 # =========================
-def run_lida_once(manager, csv_path, user_goal):
-    summary = manager.summarize(csv_path)
-    goal = {
-        "question": user_goal,
-        "visualization": (
+# Upper bound on prompts generated concurrently in multi-prompt mode
+MAX_CONCURRENT_PROMPTS = 8
+# Rough size of LIDA's system prompt, code template and completion, in tokens
+PROMPT_OVERHEAD_TOKENS = 1500
+# Prompt wording that can still be charted (counts, dates) when no column is numeric
+COUNT_OR_TIME_TERMS = (
+    "count", "number of", "how many", "frequency", "distribution", "share", " per ", " by ",
+    "date", "day", "week", "month", "quarter", "year", "trend", "over time",
+)
+# On-disk artifacts (summaries, frames) keyed by dataset hash, shared across sessions
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+# Staged uploads live in the system temp dir, one file per dataset hash
+STAGING_DIR = os.path.join(tempfile.gettempdir(), "text2viz")
+# Files older than these (seconds since last write or use) are pruned
+STAGING_MAX_AGE = 24 * 3600
+CACHE_MAX_AGE = 7 * 24 * 3600
+# Past generations (file hash + prompt -> chart), kept across restarts
+HISTORY_DB = os.path.join(CACHE_DIR, "history.db")
+
+@st.cache_resource(show_spinner=False)
+def get_manager():
+    # One Manager (and OpenAI client/connection pool) per process
+    return Manager(text_gen=llm("openai", model="gpt-4o-mini"))
+
+class TokenBucket:
+    """Thread-safe token bucket refilling `rate` tokens evenly over `period` seconds."""
+
+    def __init__(self, rate, period=60.0):
+        self.capacity = rate
+        self.fill_rate = rate / period
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, amount=1, cancelled=None):
+        """Block until `amount` tokens are taken; return False if `cancelled` is set first."""
+        amount = min(amount, self.capacity)
+        while True:
+            if cancelled is not None and cancelled.is_set():
+                return False
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return True
+                wait = (amount - self.tokens) / self.fill_rate
+            if cancelled is not None:
+                cancelled.wait(wait)
+            else:
+                time.sleep(wait)
+
+@st.cache_resource
+def get_rate_limiters(rpm, tpm):
+    # Shared by every session in the process, since they share one API key
+    return TokenBucket(rpm), TokenBucket(tpm)
+
+@st.cache_resource
+def get_executor():
+    # Not the loop's default executor, so asyncio.run never waits on an abandoned fallback
+    return ThreadPoolExecutor(max_workers=2 * MAX_CONCURRENT_PROMPTS)
+
+@st.cache_resource
+def get_plot_lock():
+    # pyplot keeps one global figure state, so chart execution must not overlap.
+    # Cached as a resource so every rerun and session shares the same lock.
+    return threading.Lock()
+
+def build_goal(user_goal):
+    return Goal(
+        question=user_goal,
+        visualization=(
             "Generate a single Matplotlib visualization that answers the question. "
             "If necessary, perform data transformations (groupby, filtering, aggregation, resampling weekly/monthly/quarterly)."
         ),
-        "rationale": "Briefly justify the visualization and transformations."
-    }
-    charts = manager.visualize(summary=summary, goal=goal, library="matplotlib")
+        rationale="Briefly justify the visualization and transformations.",
+    )
+
+def file_digest(uploaded, sheet=None):
+    h = hashlib.blake2b(uploaded.getvalue(), digest_size=16)
+    if sheet:
+        h.update(sheet.encode())
+    return h.hexdigest()
+
+def write_atomic(path, write):
+    """Call write(tmp_path) on a sibling .part file, then rename it over path."""
+    # Readers (other sessions, the next restart) see either the old file or the complete new one
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".part")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+@st.cache_data(show_spinner=False)
+def cached_summarize(file_hash, _csv_path):
+    # Keyed by content hash only; the temp path differs on every click.
+    summary_path = os.path.join(CACHE_DIR, f"{file_hash}.summary.json")
+    data_path = os.path.join(CACHE_DIR, f"{file_hash}.parquet")
+    try:
+        with open(summary_path, encoding="utf-8") as f:
+            return json.load(f), pd.read_parquet(data_path)
+    except (OSError, ValueError, pa.ArrowException):
+        # Missing or unreadable artifacts are a cache miss
+        pass
+
+    # Read the frame here rather than via manager.data, which is shared across sessions.
+    data = load_lida_frame(_csv_path)
+    summary = get_manager().summarize(data, file_name=os.path.basename(_csv_path))
+
+    def dump_summary(path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, default=str)
+
+    # Best effort: the summary sidecar is only written once the Parquet copy succeeded
+    try:
+        write_atomic(data_path, lambda path: data.to_parquet(path, engine="pyarrow", compression="zstd", index=False))
+        write_atomic(summary_path, dump_summary)
+    except (OSError, pa.ArrowException):
+        pass
+    return summary, data
+
+def generate_code(manager, summary, goal, cancelled=None):
+    # Retrying is built per call so this module still loads when the LIDA imports failed
+    for attempt in Retrying(
+        retry=retry_if_exception_type(RateLimitError),
+        wait=wait_random_exponential(min=1, max=30),
+        stop=stop_after_attempt(3),
+        reraise=True,
+    ):
+        with attempt:
+            # A cancelled speculative attempt gives up before taking rate-limit budget
+            # or spending an API call, and stops waiting on a busy limiter
+            requests, tokens = get_rate_limiters(OPENAI_RPM, OPENAI_TPM)
+            if not requests.acquire(cancelled=cancelled):
+                return []
+            if not tokens.acquire(len(str(summary)) // 4 + PROMPT_OVERHEAD_TOKENS, cancelled=cancelled):
+                return []
+            if cancelled is not None and cancelled.is_set():
+                return []
+            return manager.vizgen.generate(
+                summary=summary,
+                goal=goal,
+                textgen_config=TextGenerationConfig(),
+                text_gen=manager.text_gen,
+                library="matplotlib",
+            )
+
+def execute_charts(manager, code_specs, data, summary):
+    with get_plot_lock():
+        try:
+            return manager.execute(code_specs=code_specs, data=data, summary=summary, library="matplotlib")
+        finally:
+            # Generated code may open extra figures that LIDA's own plt.close() misses
+            plt.close("all")
+
+def fallback_can_help(summary, prompt):
+    # The summary already records LIDA's dtype per field, so no frame inspection is needed
+    if any(f["properties"].get("dtype") == "number" for f in summary.get("fields", [])):
+        return True
+    prompt = f" {prompt.lower()} "
+    return any(term in prompt for term in COUNT_OR_TIME_TERMS)
+
+async def run_lida_once(manager, summary, data, goal, cancelled=None):
+    # LIDA is synchronous: generate code (network-bound) in a worker thread,
+    # then execute it under the plot lock
+    loop = asyncio.get_running_loop()
+    code_specs = await loop.run_in_executor(get_executor(), generate_code, manager, summary, goal, cancelled)
+    if not code_specs:
+        return None, ""
+    charts = await loop.run_in_executor(get_executor(), execute_charts, manager, code_specs, data, summary)
     if not charts:
         return None, ""
     chart = charts[0]
     return getattr(chart, "raster", None), getattr(chart, "code", "")
 
-def run_lida(csv_path, prompt):
-    manager = Manager(text_gen=llm("openai", model="gpt-4o-mini"))
-    raster, code = run_lida_once(manager, csv_path, prompt)
+async def run_lida(csv_path, prompt, file_hash):
+    manager = get_manager()
+    summary, data = cached_summarize(file_hash, csv_path)
+    guided = f"{prompt}. Perform required transformations first, then plot a clear Matplotlib chart."
+
+    # Start the guided fallback speculatively so its round-trip overlaps the primary one,
+    # unless the data gives it nothing more to work with than the primary attempt
+    primary = asyncio.create_task(run_lida_once(manager, summary, data, build_goal(prompt)))
+    fallback = None
+    fallback_cancelled = threading.Event()
+    if fallback_can_help(summary, prompt):
+        fallback = asyncio.create_task(
+            run_lida_once(manager, summary, data, build_goal(guided), fallback_cancelled)
+        )
+
+    try:
+        raster, code = await primary
+    except Exception:
+        # Don't throw away a fallback that is already in flight; surface the
+        # primary's error only if the fallback can't produce a chart either
+        if fallback is None:
+            raise
+        try:
+            raster, code = await fallback
+        except Exception:
+            raster = None
+        if raster is None:
+            raise
+        return raster, code, "fallback"
     if raster is not None:
+        if fallback is not None:
+            # The worker thread can't be interrupted; it skips its API call if it hasn't
+            # started it yet, and its result is discarded either way
+            fallback_cancelled.set()
+            fallback.cancel()
         return raster, code, "primary"
-    guided = f"{prompt}. Perform required transformations first, then plot a clear Matplotlib chart."
-    raster, code = run_lida_once(manager, csv_path, guided)
+    if fallback is None:
+        return None, code, "none"
+    raster, code = await fallback
     return raster, code, ("fallback" if raster is not None else "none")
 
 def decode_raster(raster):
@@ -155,6 +306,186 @@ def decode_raster(raster):
             return None
     return None
 
+def normalize_prompt(prompt):
+    return " ".join(prompt.lower().split())
+
+def save_raster(raster_bytes):
+    # Deterministic path per image, so each PNG is written once and served from disk
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = os.path.join(CACHE_DIR, f"lida_{hashlib.sha1(raster_bytes).hexdigest()}.png")
+    if not os.path.exists(path):
+        with open(path, "wb") as f:
+            f.write(raster_bytes)
+    return path
+
+def history_conn():
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    conn = sqlite3.connect(HISTORY_DB)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS history ("
+        "file_hash TEXT, prompt TEXT, raster_path TEXT, code TEXT, attempt TEXT, ts REAL, "
+        "PRIMARY KEY (file_hash, prompt))"
+    )
+    return conn
+
+def history_lookup(file_hash, prompt_norm):
+    with closing(history_conn()) as conn:
+        row = conn.execute(
+            "SELECT raster_path, code, attempt FROM history WHERE file_hash = ? AND prompt = ?",
+            (file_hash, prompt_norm),
+        ).fetchone()
+    # Ignore rows whose PNG has since been cleaned up
+    if row and os.path.exists(row[0]):
+        return row
+    return None
+
+def history_record(file_hash, prompt_norm, raster_path, code, attempt):
+    with closing(history_conn()) as conn, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO history VALUES (?, ?, ?, ?, ?, ?)",
+            (file_hash, prompt_norm, raster_path, code, attempt, time.time()),
+        )
+
+def cached_generate(file_hash, prompt_norm, prompt, csv_path):
+    # The SQLite history is the only cache layer, keyed by the normalized prompt;
+    # only successful charts are recorded. LIDA gets the user's wording, whose
+    # casing matches the column names in the summary.
+    row = history_lookup(file_hash, prompt_norm)
+    if row is not None:
+        return row
+    raster, code, attempt = asyncio.run(run_lida(csv_path, prompt, file_hash))
+    raster_bytes = decode_raster(raster)
+    if raster_bytes is None:
+        return None, code, attempt
+    raster_path = save_raster(raster_bytes)
+    history_record(file_hash, prompt_norm, raster_path, code, attempt)
+    return raster_path, code, attempt
+
+def split_prompts(text):
+    # One question per line; lines that normalize to the same prompt run once,
+    # keeping the first wording
+    prompts = {}
+    for line in text.splitlines():
+        if line.strip():
+            prompts.setdefault(normalize_prompt(line), line.strip())
+    return list(prompts.values())
+
+async def generate_many(csv_path, prompts, file_hash):
+    sem = asyncio.Semaphore(MAX_CONCURRENT_PROMPTS)
+
+    async def one(prompt):
+        # Errors stay with their own prompt so the other charts still render
+        async with sem:
+            try:
+                raster_path, code, attempt = await asyncio.to_thread(
+                    cached_generate, file_hash, normalize_prompt(prompt), prompt, csv_path
+                )
+            except Exception as e:
+                return None, "", "none", e
+            return raster_path, code, attempt, None
+
+    return await asyncio.gather(*[one(p) for p in prompts])
+
+
+# =========================
+# File Helpers
+# =========================
+# LIDA samples larger frames down to this many rows before summarizing.
+# The sample is seeded so the summary (and everything cached from it) is reproducible.
+LIDA_SAMPLE_ROWS = 4500
+LIDA_SAMPLE_SEED = 0
+
+def read_csv_fast(path):
+    # Multi-threaded Arrow parse; pandas' parser is the fallback for files Arrow rejects
+    try:
+        table = pacsv.read_csv(
+            path,
+            read_options=pacsv.ReadOptions(use_threads=True, block_size=1 << 20),
+            # Blank string cells become NaN, as with pd.read_csv
+            convert_options=pacsv.ConvertOptions(strings_can_be_null=True, quoted_strings_can_be_null=True),
+        )
+    except pa.ArrowInvalid:
+        return pd.read_csv(path)
+    if len(set(table.column_names)) != table.num_columns:
+        # pandas renames repeated headers (a, a.1); Arrow keeps duplicates, which LIDA can't summarize
+        return pd.read_csv(path)
+    # All-blank columns are null-typed in Arrow; pandas reads them as float64 NaN
+    for i, field in enumerate(table.schema):
+        if pa.types.is_null(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.float64()))
+    return table.to_pandas(self_destruct=True, split_blocks=True, date_as_object=False)
+
+def load_lida_frame(path):
+    # Same cleanup and sampling as lida.utils.read_dataframe, with Arrow doing the parse
+    df = clean_column_names(read_csv_fast(path))
+    if len(df) > LIDA_SAMPLE_ROWS:
+        df = df.sample(n=LIDA_SAMPLE_ROWS, random_state=LIDA_SAMPLE_SEED)
+    return df
+
+def uploaded_buffer(uploaded):
+    # getvalue() never moves the UploadedFile's read position, which persists across reruns
+    return io.BytesIO(uploaded.getvalue())
+
+def is_xls(uploaded):
+    return uploaded.name.lower().endswith(".xls")
+
+# Key uploads by the same content digest used everywhere else
+@st.cache_data(show_spinner=False, hash_funcs={UploadedFile: file_digest})
+def excel_sheet_names(uploaded):
+    if is_xls(uploaded):
+        return pd.ExcelFile(uploaded_buffer(uploaded)).sheet_names
+    # read_only only parses the workbook index, not every cell
+    wb = openpyxl.load_workbook(uploaded_buffer(uploaded), read_only=True, data_only=True)
+    try:
+        return wb.sheetnames
+    finally:
+        wb.close()
+
+def write_excel_csv(uploaded, sheet, path):
+    # read_excel opens openpyxl read-only but resets the sheet dimensions and trims
+    # trailing blank rows, which raw iter_rows on a read_only sheet does not
+    engine = None if is_xls(uploaded) else "openpyxl"
+    df = pd.read_excel(uploaded_buffer(uploaded), sheet_name=sheet if sheet else 0, engine=engine)
+    df.to_csv(path, index=False)
+
+def stage_upload(uploaded, sheet, file_hash):
+    """Write the upload to STAGING_DIR as CSV once per dataset and return its path."""
+    # One file per dataset hash, shared by every session, instead of a temp file per session
+    csv_path = os.path.join(STAGING_DIR, f"{file_hash}.csv")
+    if os.path.exists(csv_path):
+        # Keep a dataset in use from aging out
+        os.utime(csv_path)
+        return csv_path
+
+    def write_upload(path):
+        if uploaded.name.lower().endswith(".csv"):
+            with open(path, "wb") as f:
+                f.write(uploaded.getvalue())
+        else:
+            write_excel_csv(uploaded, sheet, path)
+
+    write_atomic(csv_path, write_upload)
+    return csv_path
+
+@st.cache_resource(ttl=3600, show_spinner=False)
+def prune_stale_files():
+    # Runs at most once an hour per process; everything removed here is re-creatable
+    now = time.time()
+    for directory, max_age in ((STAGING_DIR, STAGING_MAX_AGE), (CACHE_DIR, CACHE_MAX_AGE)):
+        if not os.path.isdir(directory):
+            continue
+        for entry in os.scandir(directory):
+            if entry.name == os.path.basename(HISTORY_DB) or not entry.is_file():
+                continue
+            try:
+                if now - entry.stat().st_mtime > max_age:
+                    os.unlink(entry.path)
+            except OSError:
+                pass
+    if os.path.exists(HISTORY_DB):
+        with closing(history_conn()) as conn, conn:
+            conn.execute("DELETE FROM history WHERE ts < ?", (now - CACHE_MAX_AGE,))
+
 
 # =========================
 # Hero Section
@@ -180,16 +511,18 @@ with st.container():
     sheet = None
     if uploaded and uploaded.name.lower().endswith((".xlsx", ".xls")):
         try:
-            xls = pd.ExcelFile(uploaded)
-            sheet = st.selectbox("Select sheet", options=xls.sheet_names, index=0)
-            uploaded.seek(0)
+            sheet_names = excel_sheet_names(uploaded)
+            sheet = st.selectbox("Select sheet", options=sheet_names, index=0)
         except Exception:
             pass
     st.markdown("</div>", unsafe_allow_html=True)
 
 with st.container():
     st.markdown("<div class='card'>", unsafe_allow_html=True)
-    prompt = st.text_input("❓ What do you want to visualize?", placeholder="e.g., Monthly revenue trend by region")
+    prompt = st.text_area(
+        "❓ What do you want to visualize?",
+        placeholder="e.g., Monthly revenue trend by region\n(one question per line to generate several charts)",
+    )
     st.markdown("</div>", unsafe_allow_html=True)
 
 can_generate = uploaded is not None and prompt.strip() != ""
@@ -202,37 +535,41 @@ st.markdown("</div>", unsafe_allow_html=True)
 # =========================
 if generate:
     try:
-        if uploaded.name.lower().endswith(".csv"):
-            df = pd.read_csv(uploaded)
-        else:
-            df = pd.read_excel(uploaded, sheet_name=sheet if sheet else 0)
-
-        if df.empty:
+        prune_stale_files()
+        file_hash = file_digest(uploaded, sheet)
+        csv_path = stage_upload(uploaded, sheet, file_hash)
+        try:
+            preview = pd.read_csv(csv_path, nrows=10)
+        except pd.errors.EmptyDataError:
+            # An empty Excel sheet stages as a zero-byte CSV
+            preview = pd.DataFrame()
+        if preview.empty:
             st.warning("⚠️ File seems empty. Try another dataset.")
             st.stop()
 
         st.markdown("<div class='card'>", unsafe_allow_html=True)
         st.subheader("📊 Data Preview")
-        st.dataframe(df.head(10), use_container_width=True)
-
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".csv") as tmp:
-            df.to_csv(tmp.name, index=False)
-            csv_path = tmp.name
+        st.dataframe(preview, use_container_width=True)
 
+        prompts = split_prompts(prompt)
         with st.spinner("🤖 Generating visualization with GPT-4o-mini..."):
-            raster, code, attempt = run_lida(csv_path, prompt)
-
-        os.unlink(csv_path)
-        raster_bytes = decode_raster(raster)
+            # Warm the summary cache once before fanning out across prompts
+            cached_summarize(file_hash, csv_path)
+            results = asyncio.run(generate_many(csv_path, prompts, file_hash))
 
         st.subheader("📈 Visualization")
-        if raster_bytes is not None:
-            st.image(raster_bytes, caption=f"LIDA Visualization ({attempt} attempt)", use_container_width=True)
-            with st.expander("🧠 View Generated Code"):
-                st.code(code or "# No code returned", language="python")
-            st.success("✅ Visualization generated successfully!")
-        else:
-            st.error("❌ Could not generate visualization. Try rephrasing the question or using a dataset with numeric columns.")
+        for question, (raster_path, code, attempt, error) in zip(prompts, results):
+            if len(prompts) > 1:
+                st.markdown(f"**{question}**")
+            if raster_path is not None:
+                st.image(raster_path, caption=f"LIDA Visualization ({attempt} attempt)", use_container_width=True)
+                with st.expander("🧠 View Generated Code"):
+                    st.code(code or "# No code returned", language="python")
+                st.success("✅ Visualization generated successfully!")
+            elif error is not None:
+                st.error(f"⚠️ Error: {error}")
+            else:
+                st.error("❌ Could not generate visualization. Try rephrasing the question or using a dataset with numeric columns.")
 
         st.markdown("</div>", unsafe_allow_html=True)
 